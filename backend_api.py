@@ -1,21 +1,98 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-import json
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import orjson
+import msgpack
 import asyncio
+import atexit
+import hashlib
+import importlib
 import logging
+import logging.handlers
+import queue
+import time
 from datetime import datetime, timedelta
 import os
-import glob
-from pathlib import Path
 
-# Import your existing voice agent components
-from dev-calling-agent.src.agent.agent import AgenticRAG
-from dev-calling-agent.voice_agent import VoiceAssistant
+# Use the libuv-backed event loop when available - the WebSocket and /api/*
+# handlers are I/O-bound, so the cheaper task scheduling pays off directly
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    uvloop = None
+
+# Optional - the system-metrics endpoint serves fallback data without it
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Route log records through a queue so logging.info/error on the event
+# loop is just an enqueue; the listener thread does the stream I/O.
+# `python backend_api.py` imports this module twice (as __main__ and again
+# when uvicorn loads the "backend_api:app" string), so skip the install if
+# the shared root logger already has a QueueHandler - otherwise every
+# record would be emitted twice
+if not any(isinstance(h, logging.handlers.QueueHandler) for h in logging.root.handlers):
+    _log_queue: queue.Queue = queue.Queue(-1)
+    logging.root.addHandler(logging.handlers.QueueHandler(_log_queue))
+    _log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson - emits bytes directly and is
+    several times faster than stdlib json on these payloads."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=str)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # asyncio.to_thread lands on the loop's default executor, which allows
+    # up to 32 threads - far more than the handful of concurrent
+    # rag_agent.run and disk-I/O offloads this service ever has in flight.
+    # A smaller pool avoids the idle-thread memory and context-switch cost.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(
+            max_workers=min(8, (os.cpu_count() or 2) * 2),
+            thread_name_prefix="voice-worker",
+        )
+    )
+
+    # Initialize the voice agent off the loop so startup stays responsive.
+    # The package directory name contains hyphens, so it has to be loaded
+    # through importlib rather than an import statement.
+    app.state.rag_agent = None
+    try:
+        agent_module = importlib.import_module("dev-calling-agent.src.agent.agent")
+        app.state.rag_agent = await asyncio.to_thread(agent_module.AgenticRAG)
+        logging.info("Voice agent initialized successfully")
+    except Exception as e:
+        logging.error(f"Failed to initialize voice agent: {e}")
 
-app = FastAPI(title="Voice Agent API", version="1.0.0")
+    sampler = asyncio.create_task(_sample_metrics_loop())
+    yield
+    sampler.cancel()
+
+app = FastAPI(
+    title="Voice Agent API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
+
+# Compress the larger JSON payloads - the dashboard/metrics/logs bodies
+# are full of repeated keys and shrink 5-10x, which matters for the
+# polling frontend
+app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -26,18 +103,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize the voice agent
-try:
-    rag_agent = AgenticRAG()
-    logging.info("Voice agent initialized successfully")
-except Exception as e:
-    logging.error(f"Failed to initialize voice agent: {e}")
-    rag_agent = None
-
 # Pydantic models
 class QueryRequest(BaseModel):
     query: str
-    language: Optional[str] = "en"
+    language: str | None = "en"
 
 class QueryResponse(BaseModel):
     response: str
@@ -52,9 +121,9 @@ class CallRecording(BaseModel):
     language: str
     status: str
     participant_id: str
-    transcription: Optional[str] = None
-    sentiment: Optional[str] = None
-    audio_url: Optional[str] = None
+    transcription: str | None = None
+    sentiment: str | None = None
+    audio_url: str | None = None
 
 class ModelConfig(BaseModel):
     id: str
@@ -63,7 +132,7 @@ class ModelConfig(BaseModel):
     provider: str
     model: str
     status: str
-    config: Dict[str, Any]
+    config: dict[str, Any]
     last_updated: datetime
 
 class SystemMetric(BaseModel):
@@ -83,24 +152,85 @@ class LogEntry(BaseModel):
 # WebSocket connection manager
 class ConnectionManager:
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: set[WebSocket] = set()
 
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        # discard, not remove - a connection may drop mid-broadcast and be
+        # disconnected twice
+        self.active_connections.discard(websocket)
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+    async def send_personal_message(self, message: bytes | str, websocket: WebSocket):
+        if isinstance(message, bytes):
+            await websocket.send_bytes(message)
+        else:
+            await websocket.send_text(message)
 
     async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            await connection.send_text(message)
+        # Fan out concurrently - a slow client no longer stalls the rest,
+        # and return_exceptions keeps one dead socket from cancelling the
+        # other sends
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send_text(message) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
+
+    async def broadcast_bytes(self, payload: bytes):
+        # Callers pre-encode once (e.g. orjson.dumps/msgpack.packb) and the
+        # same ASGI frame goes to every connection, instead of send_text
+        # re-encoding the message per client
+        frame = {"type": "websocket.send", "bytes": payload}
+        connections = list(self.active_connections)
+        results = await asyncio.gather(
+            *(connection.send(frame) for connection in connections),
+            return_exceptions=True,
+        )
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
 
 manager = ConnectionManager()
 
+# Timestamp frozen at startup for payloads whose "last updated" time is
+# really just process start
+_STARTED_AT = datetime.now()
+
+# Short-TTL cache of serialized responses so the polled endpoints skip
+# rebuilding the same dict/Pydantic trees (and re-serializing them) per hit
+_cache: dict[str, tuple[float, bytes, str]] = {}
+
+def _etag(payload: bytes) -> str:
+    return hashlib.blake2b(payload, digest_size=8).hexdigest()
+
+def _json_response(payload: bytes, etag: str, max_age: int, request: Request) -> Response:
+    """Serve payload with an ETag, or a bodyless 304 if the client has it."""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": f"max-age={max_age}"},
+    )
+
+async def cached_json(request: Request, key: str, ttl: int, builder) -> Response:
+    """Serve builder() as JSON bytes, rebuilding at most once per ttl seconds."""
+    now = time.monotonic()
+    cached = _cache.get(key)
+    if cached is None or now >= cached[0]:
+        payload = builder()
+        if asyncio.iscoroutine(payload):
+            payload = await payload
+        cached = (now + ttl, payload, _etag(payload))
+        _cache[key] = cached
+    return _json_response(cached[1], cached[2], ttl, request)
+
 # API Routes
 
 @app.get("/api/health")
@@ -108,59 +238,75 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now()}
 
 @app.post("/api/query", response_model=QueryResponse)
-async def process_query(request: QueryRequest):
+async def process_query(query: QueryRequest, request: Request):
     """Process a text query using the RAG agent"""
+    rag_agent = request.app.state.rag_agent
     if not rag_agent:
         raise HTTPException(status_code=503, detail="Voice agent not available")
-    
+
     try:
-        start_time = datetime.now()
-        result = rag_agent.run(request.query)
-        processing_time = (datetime.now() - start_time).total_seconds()
-        
+        start = time.perf_counter()
+        # rag_agent.run is a long synchronous call - run it in a worker
+        # thread so it doesn't block every other connected client
+        result = await asyncio.to_thread(rag_agent.run, query.query)
+        processing_time = time.perf_counter() - start
+
         return QueryResponse(
             response=result.get('generation', 'No response generated'),
             confidence=0.95,  # Mock confidence score
             processing_time=processing_time,
-            language=request.language
+            language=query.language
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Query processing failed: {str(e)}")
 
-@app.get("/api/dashboard/metrics")
-async def get_dashboard_metrics():
-    """Get dashboard metrics"""
-    # Mock data - replace with actual metrics collection
-    return {
+# Mock data - replace with actual metrics collection. Tuples rather than
+# lists: the rows are shared read-only constants and orjson serializes
+# tuples as arrays natively, so rebuilding the blob allocates nothing new
+_CALL_VOLUME = (
+    {"name": "Mon", "calls": 45, "duration": 120},
+    {"name": "Tue", "calls": 52, "duration": 135},
+    {"name": "Wed", "calls": 38, "duration": 98},
+    {"name": "Thu", "calls": 61, "duration": 156},
+    {"name": "Fri", "calls": 55, "duration": 142},
+    {"name": "Sat", "calls": 28, "duration": 78},
+    {"name": "Sun", "calls": 33, "duration": 89},
+)
+
+_LANG_DIST = (
+    {"name": "English", "value": 65},
+    {"name": "Hindi", "value": 20},
+    {"name": "Bengali", "value": 10},
+    {"name": "Others", "value": 5},
+)
+
+def _build_dashboard() -> bytes:
+    return orjson.dumps({
         "total_calls": 1247,
         "active_sessions": 12,
         "avg_response_time": 1.8,
         "success_rate": 94.2,
-        "call_volume_data": [
-            {"name": "Mon", "calls": 45, "duration": 120},
-            {"name": "Tue", "calls": 52, "duration": 135},
-            {"name": "Wed", "calls": 38, "duration": 98},
-            {"name": "Thu", "calls": 61, "duration": 156},
-            {"name": "Fri", "calls": 55, "duration": 142},
-            {"name": "Sat", "calls": 28, "duration": 78},
-            {"name": "Sun", "calls": 33, "duration": 89},
-        ],
-        "language_distribution": [
-            {"name": "English", "value": 65},
-            {"name": "Hindi", "value": 20},
-            {"name": "Bengali", "value": 10},
-            {"name": "Others", "value": 5},
-        ]
-    }
+        "call_volume_data": _CALL_VOLUME,
+        "language_distribution": _LANG_DIST,
+    })
 
-@app.get("/api/recordings", response_model=List[CallRecording])
-async def get_call_recordings():
-    """Get call recordings"""
+# The mock payloads are constant, so serialize them once at import and
+# serve the frozen bytes - no per-request Pydantic work at all
+_DASHBOARD_JSON = _build_dashboard()
+_DASHBOARD_ETAG = _etag(_DASHBOARD_JSON)
+
+@app.get("/api/dashboard/metrics")
+async def get_dashboard_metrics(request: Request):
+    """Get dashboard metrics"""
+    return _json_response(_DASHBOARD_JSON, _DASHBOARD_ETAG, 30, request)
+
+def _build_recordings() -> bytes:
     # Mock data - replace with actual database query
+    now = datetime.now()
     recordings = [
-        CallRecording(
+        CallRecording.model_construct(
             id="1",
-            timestamp=datetime.now() - timedelta(hours=2),
+            timestamp=now - timedelta(hours=2),
             duration=245,
             language="English",
             status="completed",
@@ -168,9 +314,9 @@ async def get_call_recordings():
             transcription="Hello, I need help with my account...",
             sentiment="neutral"
         ),
-        CallRecording(
+        CallRecording.model_construct(
             id="2",
-            timestamp=datetime.now() - timedelta(hours=3),
+            timestamp=now - timedelta(hours=3),
             duration=180,
             language="Hindi",
             status="completed",
@@ -179,13 +325,16 @@ async def get_call_recordings():
             sentiment="positive"
         ),
     ]
-    return recordings
+    return orjson.dumps([r.model_dump() for r in recordings], default=str)
 
-@app.get("/api/models", response_model=List[ModelConfig])
-async def get_model_configurations():
-    """Get model configurations"""
+@app.get("/api/recordings")
+async def get_call_recordings(request: Request):
+    """Get call recordings"""
+    return await cached_json(request, "recordings", 30, _build_recordings)
+
+def _build_models() -> bytes:
     models = [
-        ModelConfig(
+        ModelConfig.model_construct(
             id="stt-1",
             name="Whisper Large V3",
             type="stt",
@@ -197,9 +346,9 @@ async def get_model_configurations():
                 "temperature": 0.0,
                 "response_format": "text"
             },
-            last_updated=datetime.now()
+            last_updated=_STARTED_AT
         ),
-        ModelConfig(
+        ModelConfig.model_construct(
             id="tts-1",
             name="Simba Multilingual",
             type="tts",
@@ -211,9 +360,9 @@ async def get_model_configurations():
                 "speed": 1.0,
                 "pitch": 1.0
             },
-            last_updated=datetime.now()
+            last_updated=_STARTED_AT
         ),
-        ModelConfig(
+        ModelConfig.model_construct(
             id="llm-1",
             name="Llama 3 70B",
             type="llm",
@@ -225,138 +374,254 @@ async def get_model_configurations():
                 "max_tokens": 4096,
                 "top_p": 0.9
             },
-            last_updated=datetime.now()
+            last_updated=_STARTED_AT
         ),
     ]
-    return models
+    return orjson.dumps([m.model_dump() for m in models], default=str)
+
+_MODELS_JSON = _build_models()
+_MODELS_ETAG = _etag(_MODELS_JSON)
+
+@app.get("/api/models")
+async def get_model_configurations(request: Request):
+    """Get model configurations"""
+    return _json_response(_MODELS_JSON, _MODELS_ETAG, 60, request)
 
 @app.put("/api/models/{model_id}")
-async def update_model_configuration(model_id: str, config: Dict[str, Any]):
+async def update_model_configuration(model_id: str, config: dict[str, Any]):
     """Update model configuration"""
     # Mock update - replace with actual model configuration update
     return {"message": f"Model {model_id} configuration updated successfully"}
 
-@app.get("/api/system/metrics", response_model=List[SystemMetric])
-async def get_system_metrics():
-    """Get system performance metrics"""
-    import psutil
-    
+# Frozen fallback payloads for when psutil or the log directory is
+# unavailable - built once at import like the dashboard/models blobs
+_SYSTEM_METRICS_FALLBACK_JSON = orjson.dumps([m.model_dump() for m in (
+    SystemMetric.model_construct(name="CPU Usage", value=45, unit="%", status="good", trend="stable"),
+    SystemMetric.model_construct(name="Memory Usage", value=72, unit="%", status="warning", trend="up"),
+    SystemMetric.model_construct(name="Disk Usage", value=38, unit="%", status="good", trend="stable"),
+)])
+
+_LOGS_FALLBACK_JSON = orjson.dumps([log.model_dump() for log in (
+    LogEntry.model_construct(
+        id="1",
+        timestamp=_STARTED_AT - timedelta(minutes=5),
+        level="info",
+        message="Voice agent session started successfully",
+        component="VoiceAgent"
+    ),
+    LogEntry.model_construct(
+        id="2",
+        timestamp=_STARTED_AT - timedelta(minutes=10),
+        level="warning",
+        message="High memory usage detected: 85%",
+        component="SystemMonitor"
+    ),
+)], default=str)
+
+# Most recent system counters, refreshed by the background sampler so the
+# handler never blocks the event loop on interval-based psutil calls
+_system_sample: dict[str, float] = {}
+
+async def _sample_metrics_loop():
+    """Refresh the psutil counters every 2s off the request path."""
+    if psutil is None:
+        logging.warning("psutil not available, serving fallback system metrics")
+        return
+
     try:
-        # Get actual system metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        metrics = [
-            SystemMetric(
-                name="CPU Usage",
-                value=cpu_percent,
-                unit="%",
-                status="good" if cpu_percent < 70 else "warning" if cpu_percent < 90 else "critical",
-                trend="stable"
-            ),
-            SystemMetric(
-                name="Memory Usage",
-                value=memory.percent,
-                unit="%",
-                status="good" if memory.percent < 70 else "warning" if memory.percent < 90 else "critical",
-                trend="stable"
-            ),
-            SystemMetric(
-                name="Disk Usage",
-                value=disk.percent,
-                unit="%",
-                status="good" if disk.percent < 70 else "warning" if disk.percent < 90 else "critical",
-                trend="stable"
-            ),
-        ]
-        return metrics
+        # Prime the cpu_percent delta so the first real read is meaningful
+        psutil.cpu_percent(interval=None)
     except Exception as e:
-        # Fallback to mock data
-        return [
-            SystemMetric(name="CPU Usage", value=45, unit="%", status="good", trend="stable"),
-            SystemMetric(name="Memory Usage", value=72, unit="%", status="warning", trend="up"),
-            SystemMetric(name="Disk Usage", value=38, unit="%", status="good", trend="stable"),
-        ]
+        logging.error(f"Failed to prime system metrics sampling: {e}")
 
-@app.get("/api/logs", response_model=List[LogEntry])
-async def get_system_logs():
-    """Get system logs"""
-    logs = []
-    log_dir = Path("dev-calling-agent/logs")
-    
+    while True:
+        await asyncio.sleep(2)
+        try:
+            _system_sample["cpu"] = psutil.cpu_percent(interval=None)
+            _system_sample["memory"] = psutil.virtual_memory().percent
+            _system_sample["disk"] = psutil.disk_usage('/').percent
+        except Exception as e:
+            # A flaky reading (e.g. disk_usage on a bad mount) must not kill
+            # the sampler; clear the sample so the handler serves the
+            # fallback payload instead of a stale reading until the next
+            # good pass
+            logging.error(f"System metrics sampling failed: {e}")
+            _system_sample.clear()
+
+def _metric_status(value: float) -> str:
+    return "good" if value < 70 else "warning" if value < 90 else "critical"
+
+def _build_system_metrics() -> bytes:
+    if not _system_sample:
+        # Sampler has not produced a reading yet (or psutil is missing)
+        return _SYSTEM_METRICS_FALLBACK_JSON
+
+    metrics = [
+        SystemMetric.model_construct(
+            name="CPU Usage",
+            value=_system_sample["cpu"],
+            unit="%",
+            status=_metric_status(_system_sample["cpu"]),
+            trend="stable"
+        ),
+        SystemMetric.model_construct(
+            name="Memory Usage",
+            value=_system_sample["memory"],
+            unit="%",
+            status=_metric_status(_system_sample["memory"]),
+            trend="stable"
+        ),
+        SystemMetric.model_construct(
+            name="Disk Usage",
+            value=_system_sample["disk"],
+            unit="%",
+            status=_metric_status(_system_sample["disk"]),
+            trend="stable"
+        ),
+    ]
+    return orjson.dumps([m.model_dump() for m in metrics])
+
+@app.get("/api/system/metrics")
+async def get_system_metrics(request: Request):
+    """Get system performance metrics"""
+    return await cached_json(request, "system_metrics", 10, _build_system_metrics)
+
+LOG_DIR = "dev-calling-agent/logs"
+
+def _list_logs():
+    """Return (name, mtime) for the five newest *.log files, newest first.
+
+    One scandir pass reads each entry's cached stat once, instead of the
+    glob + sort-key combination that stats every file twice.
+    """
+    with os.scandir(LOG_DIR) as it:
+        entries = [(e.name, e.stat().st_mtime) for e in it if e.name.endswith(".log")]
+    entries.sort(key=lambda t: t[1], reverse=True)
+    return entries[:5]
+
+async def _build_logs() -> bytes:
     try:
-        # Get recent log files
-        log_files = sorted(log_dir.glob("*.log"), key=os.path.getmtime, reverse=True)[:5]
-        
-        for i, log_file in enumerate(log_files):
-            # Mock log entries - replace with actual log parsing
-            logs.append(LogEntry(
+        # Directory scan is blocking I/O, so keep it off the event loop
+        log_files = await asyncio.to_thread(_list_logs)
+
+        # Mock log entries - replace with actual log parsing
+        logs = [
+            LogEntry.model_construct(
                 id=str(i),
-                timestamp=datetime.fromtimestamp(os.path.getmtime(log_file)),
+                timestamp=datetime.fromtimestamp(mtime),
                 level="info",
-                message=f"Log from {log_file.name}",
+                message=f"Log from {name}",
                 component="System"
-            ))
+            )
+            for i, (name, mtime) in enumerate(log_files)
+        ]
     except Exception as e:
         # Fallback to mock data
-        logs = [
-            LogEntry(
-                id="1",
-                timestamp=datetime.now() - timedelta(minutes=5),
-                level="info",
-                message="Voice agent session started successfully",
-                component="VoiceAgent"
-            ),
-            LogEntry(
-                id="2",
-                timestamp=datetime.now() - timedelta(minutes=10),
-                level="warning",
-                message="High memory usage detected: 85%",
-                component="SystemMonitor"
-            ),
-        ]
-    
-    return logs
+        return _LOGS_FALLBACK_JSON
+
+    return orjson.dumps([log.model_dump() for log in logs], default=str)
+
+@app.get("/api/logs")
+async def get_system_logs(request: Request):
+    """Get system logs"""
+    return await cached_json(request, "logs", 5, _build_logs)
+
+async def _handle_audio(websocket: WebSocket, message_data: dict):
+    # Process audio data here
+    # This would integrate with your voice agent
+    return {
+        "type": "transcription",
+        "text": "Transcribed text would appear here",
+        "confidence": 0.95
+    }
+
+async def _handle_text_query(websocket: WebSocket, message_data: dict):
+    rag_agent = websocket.app.state.rag_agent
+    if not rag_agent:
+        return None
+
+    try:
+        result = await asyncio.to_thread(rag_agent.run, message_data["query"])
+        return {
+            "type": "agent_response",
+            "text": result.get('generation', 'No response generated'),
+            "confidence": 0.95
+        }
+    except Exception as e:
+        return {
+            "type": "error",
+            "message": f"Processing failed: {str(e)}"
+        }
+
+# One dict lookup per message instead of chained type comparisons, and new
+# message types just register here without widening the hot path. Handlers
+# return the response dict (or None); the worker encodes it to match the
+# frame format the client sent
+_HANDLERS = {
+    "audio_data": _handle_audio,
+    "text_query": _handle_text_query,
+}
+
+async def _process_messages(frames: asyncio.Queue, websocket: WebSocket):
+    """Drain queued frames for one connection off the receive path.
+
+    Returns (ending the connection) on the first frame that cannot be
+    decoded or answered - a worker that died silently would leave the
+    receive side enqueueing into the bounded queue forever.
+    """
+    while True:
+        frame = await frames.get()
+        try:
+            # Binary msgpack frames skip base64 for audio payloads and
+            # UTF-8 validation in the websocket layer; text frames stay
+            # JSON so the stock frontend client keeps working. Replies
+            # mirror the format the frame arrived in.
+            data = frame.get("bytes")
+            if data is not None:
+                message_data = msgpack.unpackb(data, raw=False)
+            else:
+                message_data = orjson.loads(frame["text"])
+
+            handler = _HANDLERS.get(message_data["type"])
+            if not handler:
+                continue
+            response = await handler(websocket, message_data)
+            if response is None:
+                continue
+            if data is not None:
+                await manager.send_personal_message(msgpack.packb(response), websocket)
+            else:
+                await manager.send_personal_message(orjson.dumps(response).decode(), websocket)
+        except Exception as e:
+            logging.error(f"Failed to process WebSocket message: {e}")
+            return
+
+async def _receive_frames(frames: asyncio.Queue, websocket: WebSocket):
+    """Feed raw frames into the queue until the client goes away."""
+    while True:
+        # Raw receive so text and binary frames both pass through
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+        await frames.put(message)
 
 @app.websocket("/ws/voice")
 async def websocket_voice_agent(websocket: WebSocket):
     """WebSocket endpoint for real-time voice communication"""
     await manager.connect(websocket)
+    # Bounded queue decouples receiving frames from processing them, so a
+    # long rag_agent call doesn't stop the socket from draining
+    frames: asyncio.Queue = asyncio.Queue(maxsize=32)
+    worker = asyncio.create_task(_process_messages(frames, websocket))
+    receiver = asyncio.create_task(_receive_frames(frames, websocket))
     try:
-        while True:
-            data = await websocket.receive_text()
-            message_data = json.loads(data)
-            
-            if message_data["type"] == "audio_data":
-                # Process audio data here
-                # This would integrate with your voice agent
-                response = {
-                    "type": "transcription",
-                    "text": "Transcribed text would appear here",
-                    "confidence": 0.95
-                }
-                await manager.send_personal_message(json.dumps(response), websocket)
-            
-            elif message_data["type"] == "text_query":
-                # Process text query
-                if rag_agent:
-                    try:
-                        result = rag_agent.run(message_data["query"])
-                        response = {
-                            "type": "agent_response",
-                            "text": result.get('generation', 'No response generated'),
-                            "confidence": 0.95
-                        }
-                        await manager.send_personal_message(json.dumps(response), websocket)
-                    except Exception as e:
-                        error_response = {
-                            "type": "error",
-                            "message": f"Processing failed: {str(e)}"
-                        }
-                        await manager.send_personal_message(json.dumps(error_response), websocket)
-                        
-    except WebSocketDisconnect:
+        # Whichever side finishes first - client disconnect or a worker
+        # that bailed on a bad frame - ends the connection; the survivor
+        # is cancelled below
+        await asyncio.wait({worker, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        receiver.cancel()
+        worker.cancel()
         manager.disconnect(websocket)
 
 # Serve static files (React build)
@@ -364,4 +629,11 @@ app.mount("/", StaticFiles(directory="frontend/build", html=True), name="static"
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(
+        "backend_api:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if uvloop else "auto",
+        http="httptools",
+        ws="websockets",
+    )
\ No newline at end of file